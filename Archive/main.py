@@ -1,24 +1,59 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
 import uvicorn
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from util import metrics
 
 app = FastAPI()
 
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    if not metrics.ENABLED:
+        return await call_next(request)
+    # 라벨 폭증을 막기 위해 실제 경로 대신 라우트 템플릿(/data/front/{name})을 사용
+    labels = {"method": request.method, "route": "unmatched"}
+    with metrics.timer("goods_http_request") as t:
+        t.labels = labels  # 라우트는 call_next에서 매칭된 뒤에 채운다
+        try:
+            response = await call_next(request)
+        except Exception:
+            # 핸들러에서 예외가 나면 응답이 없으므로 500으로 집계하고 예외는 그대로 올린다
+            labels["route"] = getattr(request.scope.get("route"), "path", "unmatched")
+            metrics.inc("goods_http_responses", status=500, **labels)
+            raise
+        labels["route"] = getattr(request.scope.get("route"), "path", "unmatched")
+    metrics.inc("goods_http_responses", status=response.status_code, **labels)
+    return response
+
+
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
 
+@app.get("/metrics")
+def read_metrics():
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.get("/data/front/{name}")
 def send_data(name: str):
     import json
     
     try:
-        with open(f"./data/front/{name}.json", "r") as f:
-            data = json.load(f)
-            return data
+        with metrics.timer("goods_json_load"):
+            with open(f"./data/front/{name}.json", "r") as f:
+                data = json.load(f)
+        # 응답 직렬화도 따로 측정 (dict를 그대로 돌려주면 FastAPI 내부에서 인코딩되어 보이지 않음)
+        with metrics.timer("goods_json_encode"):
+            return JSONResponse(content=data)
     except FileNotFoundError:
+        metrics.inc("goods_data_errors", reason="not_found")
         return {"error": "파일을 찾을 수 없습니다"}
     except json.JSONDecodeError:
+        metrics.inc("goods_data_errors", reason="invalid_json")
         return {"error": "잘못된 JSON 형식입니다"}
 
 
@@ -1,33 +1,16 @@
 import requests
 from datetime import datetime, timedelta
 import time
+import os
+import sys
 
-risk_keywords = [
-    "사기", # 하늘 컴1 
-    "횡령", # 정수 컴1
-    "배임", # 하늘 컴2
-    "분식회계", # 하늘 컴3
-    "내부자 거래",
-    "주가조작",
-    "세금 탈루",
-    "금감원 조사",
-    "검찰 수사",
-    "경영권 분쟁",
-    "비리",
-    "경영진 구속",
-    "경영진 도피",
-    "내부고발",
-    "윤리경영 위반",
-    "리더십 리스크",
-    "갑질 논란",
-    "오너 구속",
-    "오너 해외 도피",
-    "오너 일가 재판",
-    "오너 일가 탈세",
-    "오너 일가 횡령",
-    "오너 일가 부당거래"
-]
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from util import metrics
+from util.news_store import RISK_KEYWORDS, NewsStore
 
+risk_keywords = RISK_KEYWORDS
+
+@metrics.timed("goods_fetch", source="news_webhook")
 def fetch_news_from_webhook(url: str, query: str, sd: str, ed: str, news_office_checked: str) -> dict:
     """n8n을 통해 supabase에 뉴스를 저장하는 함수
     
@@ -58,13 +41,19 @@ def fetch_news_from_webhook(url: str, query: str, sd: str, ed: str, news_office_
     try:
         response = requests.get(url, params=params)
         response.raise_for_status()
+        metrics.inc("goods_fetch_responses", source="news_webhook", status=response.status_code)
         return response.json()
     except requests.exceptions.RequestException as e:
+        metrics.inc("goods_fetch_errors", source="news_webhook")
         print(f"요청 중 오류가 발생했습니다: {e}")
         return {}
 
 url = input("n8n webhook url을 입력하세요: ")
 
+# GOODS_NEWS_DB=경로 를 주면 webhook 응답에 담긴 기사(items/articles)를 로컬 저장소에도 적재
+news_db = os.environ.get("GOODS_NEWS_DB")
+store = NewsStore(news_db) if news_db else None
+
 # CLI에서 시작연도와 월, 종료연도와 월 입력받기
 start_year = int(input("시작 연도를 입력하세요 (YYYY): "))
 start_month = int(input("시작 월을 입력하세요 (1-12): "))
@@ -123,6 +112,11 @@ while current_date.year < end_year or (current_date.year == end_year and current
                 
         # 결과 출력
         print(f"{date_str} {news_office} 결과: {result}")
+        if store is not None:
+            articles = result.get('items') or result.get('articles') or []
+            # 응답 기사에 언론사가 없으면 이번에 조회한 언론사로 채운다
+            articles = [{**a, "news_office": a.get("news_office") or news_office} for a in articles]
+            print(f"로컬 저장소 적재: {store.ingest(articles, company=query)}건")
         
         # API 호출 간 간격 두기 
         time.sleep(2)
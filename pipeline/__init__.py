@@ -0,0 +1,13 @@
+"""원천 데이터 → 가격 산정 결과까지의 증분 파이프라인
+
+CORPCODE.xml → kospi200.csv → 주가 → 변동성 표 / DART 이벤트 → 시뮬레이션 → data/front/pricing_summary.json
+
+각 단계의 입력 파일 내용 해시와 파라미터가 이전 실행과 같으면 건너뛰고,
+단계 안에서도 바뀐 종목만 다시 처리한다. 실행 상태는 data/.pipeline/state.json에 저장된다.
+
+    python -m pipeline              # 오래된 단계만 실행
+    python -m pipeline simulation   # simulation과 그 상위 단계만
+    python -m pipeline --status     # 실행하지 않고 상태만 확인
+"""
+from pipeline.runner import Pipeline, Stage, StageContext
+from pipeline.stages import default_stages
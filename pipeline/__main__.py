@@ -0,0 +1,46 @@
+import os
+import json
+import argparse
+
+from util import metrics
+from pipeline.runner import Pipeline
+from pipeline.stages import DATA_DIR, default_stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m pipeline", description="데이터 → 가격 산정 증분 파이프라인")
+    parser.add_argument("stages", nargs="*", help="실행할 단계 (기본: 전체, 지정하면 상위 단계 포함)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="data 폴더 경로")
+    parser.add_argument("--as-of", help="기준일 YYYY-MM-DD (기본: 오늘)")
+    parser.add_argument("--params", help="시뮬레이션 파라미터 JSON 파일")
+    parser.add_argument("--seed", type=int, default=0, help="시뮬레이션 기본 시드")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 실행할 단계 수")
+    parser.add_argument("--sim-workers", type=int, default=None, help="시뮬레이션 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--force", action="store_true", help="캐시를 무시하고 모두 다시 실행")
+    parser.add_argument("--status", action="store_true", help="실행하지 않고 단계별 재실행 필요 여부만 출력")
+    parser.add_argument("--metrics-report", help="단계별 소요 시간 JSON 리포트 저장 경로")
+    args = parser.parse_args(argv)
+
+    sim_params = {}
+    if args.params:
+        with open(args.params, "r", encoding="utf-8") as f:
+            sim_params = json.load(f)
+
+    stages = default_stages(args.data_dir, as_of=args.as_of, sim_params=sim_params,
+                            seed=args.seed, workers=args.sim_workers)
+    pipeline = Pipeline(stages, os.path.join(args.data_dir, ".pipeline", "state.json"),
+                        workers=args.workers, force=args.force)
+
+    if args.status:
+        for name, stale in pipeline.status(args.stages).items():
+            print(f"{name:12s} {'실행 필요' if stale else '최신'}")
+        return
+
+    results = pipeline.run(args.stages)
+    ran = [name for name, did_run in results.items() if did_run]
+    print(f"완료: {len(ran)}개 단계 실행 ({', '.join(ran) or '없음'}), {len(results) - len(ran)}개 건너뜀")
+    metrics.dump_report(args.metrics_report)
+
+
+if __name__ == "__main__":
+    main()
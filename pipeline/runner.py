@@ -0,0 +1,312 @@
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from util import metrics
+
+
+def _sha256_file(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Stage:
+    """파이프라인 한 단계
+
+    Args:
+        name (str): 단계 이름
+        func (callable): func(ctx) 형태의 실행 함수
+        inputs (list): 입력 파일/폴더 경로 (내용 해시로 변경 여부 판단)
+        outputs (list): 출력 파일/폴더 경로 (없으면 다시 실행)
+        params (dict): 결과에 영향을 주는 파라미터 (바뀌면 다시 실행)
+        version (str): 단계 코드 버전 (로직을 바꾸면 올려서 강제로 다시 실행)
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=None, version="1"):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+        self.version = version
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+class StageContext:
+    """단계 함수에 넘겨주는 실행 정보 + 항목(종목) 단위 캐시
+
+    단계 안에서 종목별로 바뀐 것만 다시 처리하려면:
+
+        todo = ctx.stale({code: fingerprint for code in codes})
+        for code in todo:
+            ...
+            ctx.mark(code, fingerprint)
+    """
+
+    def __init__(self, stage, runner, prev_items):
+        self.stage = stage
+        self.runner = runner
+        self.inputs = stage.inputs
+        self.outputs = stage.outputs
+        self.params = stage.params
+        self.items = dict(prev_items)
+        self._lock = threading.Lock()
+
+    def stale(self, fingerprints):
+        """fingerprint가 이전 실행과 다른 항목만 골라서 반환 (force면 전부)"""
+        if self.runner.force:
+            return list(fingerprints)
+        return [key for key, fp in fingerprints.items() if self.items.get(key) != fp]
+
+    def mark(self, key, fingerprint):
+        with self._lock:
+            self.items[key] = fingerprint
+
+    def forget(self, keys):
+        """더 이상 대상이 아닌 항목 정리 (예: 지수에서 빠진 종목)"""
+        with self._lock:
+            for key in keys:
+                self.items.pop(key, None)
+
+    def log(self, message):
+        self.runner.log(f"[{self.stage.name}] {message}")
+
+
+class Pipeline:
+    """입출력 경로로 단계 간 의존관계를 정하고, 내용 해시가 바뀐 단계만 실행
+
+    Args:
+        stages (list): Stage 목록 (순서 무관, 출력 경로가 다른 단계의 입력이면 의존관계)
+        state_path (str): 실행 상태(fingerprint) 저장 JSON 경로
+        workers (int): 동시에 실행할 단계 수
+        force (bool): 캐시를 무시하고 모두 다시 실행
+        verbose (bool): 진행 로그 출력 여부
+    """
+
+    def __init__(self, stages, state_path, workers=4, force=False, verbose=True):
+        names = [s.name for s in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("단계 이름이 중복되었습니다")
+        self.stages = {s.name: s for s in stages}
+        self.state_path = state_path
+        self.workers = workers
+        self.force = force
+        self.verbose = verbose
+        self._state_lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self.state = self._load_state()
+        self.deps = self._resolve_deps()
+
+    # ✅ 상태 파일
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            state = {}
+        state.setdefault("stages", {})
+        state.setdefault("hashes", {})
+        return state
+
+    def _save_state(self):
+        with self._state_lock:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            tmp = f"{self.state_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.state_path)
+
+    # ✅ 의존관계
+    def _resolve_deps(self):
+        producer = {}
+        for stage in self.stages.values():
+            for out in stage.outputs:
+                producer[os.path.normpath(out)] = stage.name
+
+        deps = {}
+        for stage in self.stages.values():
+            deps[stage.name] = {producer[os.path.normpath(i)] for i in stage.inputs
+                                if os.path.normpath(i) in producer} - {stage.name}
+
+        # 순환 의존 검사
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"순환 의존이 있습니다: {name}")
+            visiting.add(name)
+            for d in deps[name]:
+                visit(d)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in deps:
+            visit(name)
+        return deps
+
+    def _select(self, targets):
+        """targets 단계와 그 상위 단계 전부"""
+        if not targets:
+            return set(self.stages)
+        unknown = set(targets) - set(self.stages)
+        if unknown:
+            raise ValueError(f"알 수 없는 단계: {', '.join(sorted(unknown))}")
+        selected, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in selected:
+                selected.add(name)
+                todo.extend(self.deps[name])
+        return selected
+
+    # ✅ 내용 해시
+    def hash_file(self, path):
+        """파일 내용 해시 (크기와 수정 시각이 같으면 이전 해시 재사용)"""
+        st = os.stat(path)
+        key = os.path.abspath(path)
+        with self._state_lock:
+            cached = self.state["hashes"].get(key)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            return cached[2]
+        digest = _sha256_file(path)
+        with self._state_lock:
+            self.state["hashes"][key] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def hash_path(self, path):
+        """파일이면 내용 해시, 폴더면 (상대경로, 내용 해시) 목록의 해시, 없으면 None"""
+        if os.path.isfile(path):
+            return self.hash_file(path)
+        if os.path.isdir(path):
+            h = hashlib.sha256()
+            for base, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    full = os.path.join(base, name)
+                    h.update(os.path.relpath(full, path).encode("utf-8"))
+                    h.update(self.hash_file(full).encode("ascii"))
+            return h.hexdigest()
+        return None
+
+    def fingerprint(self, stage):
+        payload = {
+            "version": stage.version,
+            "params": stage.params,
+            "inputs": [self.hash_path(i) for i in stage.inputs],
+        }
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _missing_inputs(self, stage):
+        return [i for i in stage.inputs if not os.path.exists(i)]
+
+    def is_stale(self, stage):
+        if self.force:
+            return True
+        if not all(os.path.exists(o) for o in stage.outputs):
+            return True
+        prev = self.state["stages"].get(stage.name, {})
+        return prev.get("fingerprint") != self.fingerprint(stage)
+
+    # ✅ 실행
+    def log(self, message):
+        if self.verbose:
+            with self._log_lock:
+                print(message, flush=True)
+
+    def _run_stage(self, stage):
+        if not self.is_stale(stage):
+            self.log(f"[{stage.name}] 변경 없음, 건너뜀")
+            metrics.inc("goods_pipeline_stage_skipped", stage=stage.name)
+            return False
+
+        missing = self._missing_inputs(stage)
+        if missing:
+            # 원천 파일(CORPCODE.xml 등)이 없으면 이 단계는 건너뛰고 기존 출력이 있으면 그대로 사용
+            # (출력도 없으면 이 출력을 입력으로 쓰는 하위 단계도 같은 이유로 건너뛴다)
+            self.log(f"[{stage.name}] 입력 파일이 없어 건너뜀: {', '.join(missing)}")
+            metrics.inc("goods_pipeline_stage_skipped", stage=stage.name)
+            return False
+
+        fingerprint = self.fingerprint(stage)
+        prev_items = self.state["stages"].get(stage.name, {}).get("items", {})
+        ctx = StageContext(stage, self, prev_items)
+        self.log(f"[{stage.name}] 실행")
+        try:
+            with metrics.timer("goods_pipeline_stage", stage=stage.name):
+                stage.func(ctx)
+        except BaseException:
+            # 실패해도 이미 끝난 항목은 기억해서 다음 실행 때 이어서 처리
+            with self._state_lock:
+                self.state["stages"].setdefault(stage.name, {})["items"] = ctx.items
+            self._save_state()
+            raise
+
+        with self._state_lock:
+            self.state["stages"][stage.name] = {"fingerprint": fingerprint, "items": ctx.items}
+        self._save_state()
+        metrics.inc("goods_pipeline_stage_runs", stage=stage.name)
+        return True
+
+    def run(self, targets=None):
+        """오래된 단계만 의존 순서대로 실행 (서로 독립인 단계는 병렬)
+
+        Args:
+            targets (list): 실행할 단계 이름 (None이면 전체, 지정하면 상위 단계 포함)
+
+        Returns:
+            dict: {단계 이름: 실제로 실행했으면 True, 건너뛰었으면 False}
+        """
+        selected = self._select(targets)
+        pending = {name: self.deps[name] & selected for name in selected}
+        results = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            running = {}
+            while pending or running:
+                ready = [n for n, d in pending.items() if not (d - set(results))]
+                for name in sorted(ready):
+                    del pending[name]
+                    running[pool.submit(self._run_stage, self.stages[name])] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except BaseException:
+                        # 실행 중인 다른 단계는 끝까지 기다리고 예외를 올린다
+                        wait(running)
+                        raise
+        self._save_state()
+        return results
+
+    def status(self, targets=None):
+        """단계별 재실행 필요 여부 (실행하지 않고 확인만)
+
+        상위 단계가 다시 돌면 입력이 바뀔 수 있으므로, 상위가 오래된 경우도 오래된 것으로 본다.
+        """
+        selected = self._select(targets)
+        result = {}
+
+        def visit(name):
+            if name not in result:
+                stage = self.stages[name]
+                upstream = any([visit(d) for d in self.deps[name] & selected])
+                # 상위 단계가 만들어 줄 입력이 아닌데 없으면 실행해도 건너뛰므로 최신으로 본다
+                result[name] = upstream or (not self._missing_inputs(stage) and self.is_stale(stage))
+            return result[name]
+
+        for name in sorted(selected):
+            visit(name)
+        return result
@@ -0,0 +1,402 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import multiprocessing
+from functools import partial
+from datetime import date, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+from util import metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+
+DART_LIST_URL = "https://opendart.fss.or.kr/api/list.json"
+DART_KEYWORDS = ["횡령", "배임"]
+DART_START_DATE = "20200624"
+# 000: 정상, 013: 조회된 데이터 없음. 나머지(010 키 오류, 020 요청 제한, 800 점검 등)는 실패로 처리
+DART_OK_STATUSES = ("000", "013")
+
+# 수익률 평균/표준편차를 낼 수 있는 최소 주가 행 수 (이보다 짧은 종목은 시뮬레이션에서 제외)
+MIN_PRICE_ROWS = 20
+
+# 주가 보관 기간 (변동성 표의 10년 변동성까지 계산할 수 있도록 10년치)
+PRICE_HISTORY_DAYS = 3653
+# 시뮬레이션 수익률 추정에 쓰는 기간 (pricing.simulation.load_stock_data와 같은 18개월)
+SIM_HISTORY_MONTHS = 18
+# 변동성 표 기간 (de_jy/코스피200변동성.ipynb와 같은 1/3/5/10년, 연환산)
+VOL_YEARS = (1, 3, 5, 10)
+
+
+def to_yf_ticker(stock_code):
+    return f"{str(stock_code).zfill(6)}.KS"
+
+
+def _read_kospi200(path):
+    import pandas as pd
+
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    df["stock_code"] = df["stock_code"].str.zfill(6)
+    df["corp_code"] = df["corp_code"].str.zfill(8)
+    return df
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+# ✅ 1) CORPCODE.xml → CORPCODE.csv
+def corpcode_csv(ctx):
+    from util.xml2csv import xml_to_csv
+
+    xml_to_csv(ctx.inputs[0], ctx.outputs[0])
+
+
+# ✅ 2) 상장법인목록.csv + CORPCODE.csv → kospi200.csv (종목코드로 corp_code 매핑)
+def kospi200_merge(ctx):
+    import pandas as pd
+
+    listed_path, corpcode_path = ctx.inputs
+    df_kospi = pd.read_csv(listed_path, encoding="cp949", dtype=str)[["회사명", "종목코드"]]
+    df_kospi.columns = ["company_name", "stock_code"]
+    df_kospi["stock_code"] = df_kospi["stock_code"].str.zfill(6)
+
+    df_corp = pd.read_csv(corpcode_path, dtype=str, encoding="utf-8-sig")[["corp_code", "stock_code"]]
+    df_corp["stock_code"] = df_corp["stock_code"].str.strip()
+
+    df_merged = pd.merge(df_kospi, df_corp, on="stock_code", how="inner")
+    df_merged[["company_name", "stock_code", "corp_code"]].to_csv(ctx.outputs[0], index=False, encoding="utf-8-sig")
+
+
+# ✅ 3) 종목별 주가 다운로드 (이미 받은 마지막 날짜부터 이어서 받음)
+def download_prices(ctx):
+    import pandas as pd
+    import yfinance as yf
+
+    out_dir = ctx.outputs[0]
+    os.makedirs(out_dir, exist_ok=True)
+    codes = list(_read_kospi200(ctx.inputs[0])["stock_code"])
+    as_of = ctx.params["as_of"]
+    history_days = int(ctx.params["history_days"])
+    today = date.fromisoformat(as_of)
+    first_day = today - timedelta(days=history_days)
+
+    # 지수에서 빠진 종목은 파일과 기록을 정리
+    dropped = set(ctx.items) - set(codes)
+    for code in dropped:
+        path = os.path.join(out_dir, f"{code}.csv")
+        if os.path.exists(path):
+            os.remove(path)
+    ctx.forget(dropped)
+
+    # 보관 기간이 바뀐 종목(예: 548일 → 10년)은 처음부터 다시 받아서 앞쪽 기간을 채운다
+    resync = {code for code in codes
+              if not isinstance(ctx.items.get(code), dict) or ctx.items[code].get("history_days") != history_days}
+    todo = ctx.stale({code: {"as_of": as_of, "history_days": history_days} for code in codes})
+    ctx.log(f"{len(todo)}/{len(codes)} 종목 갱신")
+    for code in todo:
+        path = os.path.join(out_dir, f"{code}.csv")
+        old = pd.read_csv(path, index_col=0, parse_dates=True) if os.path.exists(path) else None
+        # 마지막 날짜부터 다시 받는다 (장중에 받은 그날 종가는 확정 전이라 다음 실행 때 덮어써야 함)
+        start = first_day if old is None or old.empty or code in resync else old.index[-1].date()
+        if start <= today:
+            data = yf.download(to_yf_ticker(code), start, today + timedelta(days=1), progress=False)
+            # 상장폐지/잘못된 종목코드면 빈 프레임이 오므로 기존 파일을 그대로 둔다
+            if not data.empty:
+                close = data["Close"]
+                if isinstance(close, pd.DataFrame):
+                    close = close.iloc[:, 0]
+                new = close.dropna().rename("Close").to_frame()
+                new.index = pd.DatetimeIndex(new.index, name="Date")
+                merged = new if old is None else pd.concat([old, new])
+                merged = merged[~merged.index.duplicated(keep="last")]
+                # 보관 기간은 마지막 거래일 기준 (기준일 기준이면 새 주가가 없는 주말에도 파일이 바뀜)
+                merged = merged[merged.index >= merged.index[-1] - pd.Timedelta(days=history_days)]
+                merged.to_csv(path)
+                metrics.inc("goods_pipeline_prices_downloaded", len(new))
+            else:
+                ctx.log(f"{code}: 새 주가 없음")
+            time.sleep(0.3)
+        ctx.mark(code, {"as_of": as_of, "history_days": history_days})
+
+
+# ✅ 4) 종목별 1/3/5/10년 연환산 변동성 표 (주가 파일이 바뀐 종목만 다시 계산)
+def volatility_table(ctx):
+    import numpy as np
+    import pandas as pd
+
+    kospi_path, price_dir = ctx.inputs
+    out_path = ctx.outputs[0]
+    kospi = _read_kospi200(kospi_path)
+    vol_columns = [f"vol_{years}y" for years in VOL_YEARS]
+    columns = ["company_name", "stock_code", "corp_code", *vol_columns]
+
+    fingerprints = {}
+    for code in kospi["stock_code"]:
+        path = os.path.join(price_dir, f"{code}.csv")
+        fingerprints[code] = ctx.runner.hash_file(path) if os.path.exists(path) else None
+
+    old = {}
+    if os.path.exists(out_path):
+        prev = pd.read_csv(out_path, dtype={"stock_code": str, "corp_code": str}, encoding="utf-8-sig")
+        if set(columns) <= set(prev.columns):  # 예전 형식(mu_1y/sigma_1y) 파일이면 전부 다시 계산
+            old = {row["stock_code"]: row for row in prev.to_dict("records")}
+    todo = set(ctx.stale(fingerprints)) | (set(fingerprints) - set(old))
+    ctx.log(f"{len(todo)}/{len(fingerprints)} 종목 재계산")
+
+    rows = []
+    for company, code, corp_code in zip(kospi["company_name"], kospi["stock_code"], kospi["corp_code"]):
+        if code not in todo:
+            rows.append({**old[code], "company_name": company, "corp_code": corp_code})
+            continue
+        row = {"company_name": company, "stock_code": code, "corp_code": corp_code, **dict.fromkeys(vol_columns, np.nan)}
+        path = os.path.join(price_dir, f"{code}.csv")
+        price = pd.read_csv(path, index_col=0, parse_dates=True)["Close"] if fingerprints[code] is not None else None
+        if price is not None and not price.empty:
+            log_ret = np.log(price.ffill().bfill()).diff().dropna()
+            for years, column in zip(VOL_YEARS, vol_columns):
+                subset = log_ret[log_ret.index >= price.index.max() - pd.DateOffset(years=years)]
+                if not subset.empty:
+                    row[column] = subset.std() * np.sqrt(252)  # 일별 표준편차 × √252
+        rows.append(row)
+        ctx.mark(code, fingerprints[code])
+
+    pd.DataFrame(rows, columns=columns).to_csv(out_path, index=False, encoding="utf-8-sig")
+
+
+def _search_dart_events(corp_code, api_key, keywords, start_date, end_date):
+    """DART 공시 목록에서 제목에 키워드가 들어간 보고서 검색 (페이지 끝까지)"""
+    import requests
+
+    page_no = 1
+    hits = []
+    while True:
+        params = {
+            "crtfc_key": api_key,
+            "corp_code": corp_code,
+            "bgn_de": start_date,
+            "end_de": end_date,
+            "page_no": page_no,
+            "page_count": 100
+        }
+        res = requests.get(DART_LIST_URL, params=params, timeout=10)
+        res.raise_for_status()
+        data = res.json()
+        status = data.get("status")
+        if status not in DART_OK_STATUSES:
+            raise RuntimeError(f"DART 조회 실패 ({corp_code}): {status} {data.get('message', '')}")
+        if status == "013" or "list" not in data:
+            break
+
+        for item in data["list"]:
+            title = item.get("report_nm", "")
+            if any(kw in title for kw in keywords):
+                hits.append(item)
+
+        if len(data["list"]) < 100:
+            break
+        page_no += 1
+        time.sleep(0.3)
+    return hits
+
+
+# ✅ 5) DART 이벤트 검색 → merged_event_final.csv (기업별로 마지막 검색일부터 추가 검색)
+def dart_events(ctx):
+    import pandas as pd
+
+    out_path = ctx.outputs[0]
+    api_key = os.environ.get("DART_API_KEY")
+    if not api_key:
+        if os.path.exists(out_path):
+            ctx.log("DART_API_KEY가 없어 기존 이벤트 파일을 그대로 사용합니다")
+            return
+        raise RuntimeError("DART_API_KEY 환경변수를 설정하세요")
+
+    kospi = _read_kospi200(ctx.inputs[0])
+    keywords = ctx.params["keywords"]
+    end_date = ctx.params["as_of"].replace("-", "")
+    columns = ["company_corp_id", "source", "title", "date"]
+
+    events = pd.DataFrame(columns=columns)
+    if os.path.exists(out_path):
+        events = pd.read_csv(out_path, dtype=str, encoding="utf-8-sig")
+        events["company_corp_id"] = events["company_corp_id"].str.zfill(8)
+
+    # 키워드/시작일이 같은 기업은 이어서, 아니면 처음부터 검색
+    scan_key = f"{','.join(keywords)}|{ctx.params['start_date']}"
+    corp_codes = set(kospi["corp_code"])
+    if not ctx.runner.force:
+        keep = {code for code, item in ctx.items.items() if code in corp_codes and item.get("scan") == scan_key}
+    else:
+        keep = set()
+    # 지수에서 빠진 기업만 바로 정리. 나머지 기존 이벤트는 해당 기업을 다시 검색하는 데 성공했을 때만 교체한다
+    events = events[events["company_corp_id"].isin(corp_codes)]
+    ctx.forget(set(ctx.items) - keep)
+
+    scanned = 0
+    try:
+        for company, corp_code in zip(kospi["company_name"], kospi["corp_code"]):
+            prev = ctx.items.get(corp_code)
+            if prev and prev["until"] >= end_date:
+                continue
+            # 마지막 검색일 당일도 다시 검색 (그날 늦게 접수된 공시를 놓치지 않도록, 겹치는 공시는 source로 중복 제거)
+            start = prev["until"] if prev else ctx.params["start_date"]
+
+            # 실패하면 예외가 올라가서 이 기업은 mark되지 않고 다음 실행 때 다시 검색된다
+            hits = _search_dart_events(corp_code, api_key, keywords, start, end_date)
+            new = pd.DataFrame([{
+                "company_corp_id": corp_code,
+                "source": f"https://dart.fss.or.kr/dsaf001/main.do?rcpNo={item['rcept_no']}",
+                "title": f"{company}/{item.get('report_nm', '').strip()}",
+                "date": f"{item['rcept_dt'][:4]}.{item['rcept_dt'][4:6]}.{item['rcept_dt'][6:]}",
+            } for item in hits], columns=columns)
+            if not prev:
+                events = events[events["company_corp_id"] != corp_code]  # 처음부터 다시 검색한 기업은 결과 교체
+            events = pd.concat([events, new], ignore_index=True)
+            ctx.mark(corp_code, {"scan": scan_key, "until": end_date})
+            scanned += 1
+            time.sleep(0.3)  # DART API 제한 방지
+    finally:
+        # 중간에 실패해도 이미 검색한 기업의 결과는 mark와 함께 저장해 둔다
+        ctx.log(f"{scanned}/{len(kospi)} 기업 검색")
+        events = events.drop_duplicates(subset=["source"]).sort_values(["company_corp_id", "date"], ascending=[True, False])
+        events.to_csv(out_path, index=False, encoding="utf-8-sig")
+
+
+def _sim_window(stock_data):
+    """시뮬레이션에 쓰는 최근 SIM_HISTORY_MONTHS개월 주가"""
+    import pandas as pd
+
+    if stock_data.empty:
+        return stock_data
+    return stock_data[stock_data.index >= stock_data.index.max() - pd.DateOffset(months=SIM_HISTORY_MONTHS)]
+
+
+def _price_one(code, price_path, params, seed):
+    """프로세스 풀 워커: 종목 하나 시뮬레이션 후 (요약, 시뮬레이션 소요 시간) 반환
+
+    워커 프로세스의 메트릭은 부모로 돌아오지 않으므로 소요 시간은 부모에서 기록한다.
+    """
+    import pandas as pd
+    from pricing.simulation import simulate, summarize
+
+    stock_data = _sim_window(pd.read_csv(price_path, index_col=0, parse_dates=True))
+    start = time.perf_counter()
+    result = simulate(to_yf_ticker(code), params, seed=seed, stock_data=stock_data)
+    elapsed = time.perf_counter() - start
+    summary = summarize(result)
+    summary["params"] = params
+    return summary, elapsed
+
+
+# ✅ 6) 종목별 보험 가격 시뮬레이션 → data/front/pricing_summary.json
+def price_products(ctx, workers=None):
+    import pandas as pd
+    from pricing.simulation import DEFAULT_PARAMS
+
+    kospi_path, price_dir, events_path = ctx.inputs
+    summary_path, out_dir = ctx.outputs
+    kospi = _read_kospi200(kospi_path)
+
+    # 기업별 연간 이벤트 발생률 = 검색 기간 이벤트 수 / 검색 기간 연수 (이벤트가 없으면 기본 λ 사용)
+    events = pd.read_csv(events_path, dtype=str, encoding="utf-8-sig")
+    event_counts = events["company_corp_id"].str.zfill(8).value_counts().to_dict()
+    years = ctx.params["event_years"]
+
+    jobs = {}
+    fingerprints = {}
+    for code, corp_code in zip(kospi["stock_code"], kospi["corp_code"]):
+        price_path = os.path.join(price_dir, f"{code}.csv")
+        if not os.path.exists(price_path):
+            continue
+        if len(_sim_window(pd.read_csv(price_path, index_col=0, parse_dates=True))["Close"].dropna()) < MIN_PRICE_ROWS:
+            ctx.log(f"{code}: 주가 데이터가 {MIN_PRICE_ROWS}일 미만이라 제외")
+            continue
+        params = {**DEFAULT_PARAMS, **ctx.params["sim_params"]}
+        n_events = event_counts.get(corp_code, 0)
+        if n_events:
+            params["lambda_event"] = n_events / years
+        seed = (ctx.params["seed"] + zlib.crc32(code.encode())) % (2 ** 32)
+        jobs[code] = (price_path, params, seed)
+        raw = json.dumps([ctx.runner.hash_file(price_path), params, seed], sort_keys=True)
+        fingerprints[code] = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        if not os.path.exists(os.path.join(out_dir, f"{code}.json")):
+            ctx.items.pop(code, None)
+
+    todo = ctx.stale(fingerprints)
+    ctx.log(f"{len(todo)}/{len(jobs)} 종목 시뮬레이션")
+    # 러너 스레드 안에서 fork하면 다른 단계 스레드가 잡고 있던 락 때문에 멈출 수 있어서 spawn 사용
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {code: pool.submit(_price_one, code, *jobs[code]) for code in todo}
+        for code, future in futures.items():
+            summary, elapsed = future.result()
+            metrics.record("goods_run_loss_simulations", elapsed)
+            _write_json(os.path.join(out_dir, f"{code}.json"), summary)
+            ctx.mark(code, fingerprints[code])
+
+    ctx.forget(set(ctx.items) - set(jobs))
+    summaries = []
+    for company, code in zip(kospi["company_name"], kospi["stock_code"]):
+        if code in jobs:
+            with open(os.path.join(out_dir, f"{code}.json"), "r", encoding="utf-8") as f:
+                summaries.append({"company_name": company, "stock_code": code, **json.load(f)})
+    _write_json(summary_path, summaries)
+
+
+def event_window_years(start_date, as_of):
+    """DART 이벤트 검색 기간(start_date YYYYMMDD ~ as_of YYYY-MM-DD)의 연수 (개월 단위로 반올림)
+
+    날마다 값이 바뀌면 시뮬레이션 단계와 모든 종목의 fingerprint가 매일 바뀌므로
+    개월 단위로 맞춰서 한 달에 한 번만 바뀌게 한다.
+    """
+    start = date(int(start_date[:4]), int(start_date[4:6]), int(start_date[6:]))
+    days = (date.fromisoformat(as_of) - start).days + 1
+    if days <= 0:
+        raise ValueError(f"기준일({as_of})이 DART 검색 시작일({start_date})보다 빠릅니다")
+    months = max(1, round(days / (365.25 / 12)))
+    return months / 12
+
+
+def default_stages(data_dir=DATA_DIR, as_of=None, sim_params=None, seed=0, workers=None):
+    """원천 데이터 → 가격 산정까지 기본 단계 목록
+
+    Args:
+        data_dir (str): data 폴더 경로
+        as_of (str): 기준일 (YYYY-MM-DD, 기본: 오늘). 날짜가 바뀌면 주가/DART 단계가 새 날짜분만 받는다
+        sim_params (dict): 시뮬레이션 파라미터 (DEFAULT_PARAMS 덮어쓰기)
+        seed (int): 시뮬레이션 기본 시드
+        workers (int): 시뮬레이션 프로세스 수
+    """
+    as_of = as_of or date.today().isoformat()
+    p = lambda *parts: os.path.join(data_dir, *parts)
+
+    from pipeline.runner import Stage
+    return [
+        Stage("corpcode", corpcode_csv,
+              inputs=[p("corpcode_data", "CORPCODE.xml")],
+              outputs=[p("corpcode_data", "CORPCODE.csv")]),
+        Stage("kospi200", kospi200_merge,
+              inputs=[p("상장법인목록.csv"), p("corpcode_data", "CORPCODE.csv")],
+              outputs=[p("kospi200.csv")]),
+        Stage("prices", download_prices,
+              inputs=[p("kospi200.csv")],
+              outputs=[p("prices")],
+              params={"as_of": as_of, "history_days": PRICE_HISTORY_DAYS}),
+        Stage("volatility", volatility_table,
+              inputs=[p("kospi200.csv"), p("prices")],
+              outputs=[p("kospi200_log_return_vol.csv")]),
+        Stage("dart_events", dart_events,
+              inputs=[p("kospi200.csv")],
+              outputs=[p("merged_event_final.csv")],
+              params={"as_of": as_of, "keywords": DART_KEYWORDS, "start_date": DART_START_DATE,
+                      "api_key_set": bool(os.environ.get("DART_API_KEY"))}),
+        Stage("simulation", partial(price_products, workers=workers),
+              inputs=[p("kospi200.csv"), p("prices"), p("merged_event_final.csv")],
+              outputs=[p("front", "pricing_summary.json"), p("pricing")],
+              params={"sim_params": sim_params or {}, "seed": seed,
+                      "event_years": event_window_years(DART_START_DATE, as_of)}),
+    ]
@@ -0,0 +1,32 @@
+"""포아송 점프 모형 기반 주가 하락 보험 가격 산정 라이브러리
+
+무거운 의존성(numpy, pandas, yfinance, matplotlib)은 실제로 쓰일 때 불러오므로
+`import pricing` 자체는 가볍다 (프로세스 풀 워커, API 서버에서 재사용 가능).
+
+    from pricing import simulate, summarize, DEFAULT_PARAMS
+    summary = summarize(simulate('005930.KS', DEFAULT_PARAMS, seed=42))
+"""
+
+_LAZY = {
+    'DEFAULT_PARAMS': 'pricing.simulation',
+    'load_stock_data': 'pricing.simulation',
+    'calc_return_stats': 'pricing.simulation',
+    'run_loss_simulations': 'pricing.simulation',
+    'simulate': 'pricing.simulation',
+    'summarize': 'pricing.simulation',
+    'set_korean_font': 'pricing.viz',
+    'viz_loss': 'pricing.viz',
+    'build_aggregates': 'pricing.report',
+    'render_report': 'pricing.report',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'pricing' has no attribute {name!r}")
@@ -0,0 +1,73 @@
+import argparse
+import json
+import sys
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pricing",
+        description="포아송 점프 모형으로 종목별 보험금/보험료 시뮬레이션 (기본: headless, matplotlib 미사용)")
+    parser.add_argument("tickers", nargs="+", help="종목코드 목록 (예: 005930.KS 000660.KS)")
+    parser.add_argument("--params", help="시뮬레이션 파라미터 JSON 파일 (없는 키는 기본값 사용)")
+    parser.add_argument("--seed", type=int, default=None, help="난수 시드 (종목 순서대로 seed, seed+1, ...)")
+    parser.add_argument("--output", "-o", default="-", help="요약 결과 JSON 저장 경로 (기본: 표준출력)")
+    parser.add_argument("--plot", action="store_true", help="viz_loss로 그래프 표시 (matplotlib 필요)")
+    parser.add_argument("--report-dir", help="리포트 그래프(PNG/SVG) 저장 폴더 (Agg 백엔드, 창을 띄우지 않음)")
+    parser.add_argument("--report-format", choices=("png", "svg"), default="png", help="리포트 그래프 형식")
+    parser.add_argument("--workers", type=int, default=None, help="리포트 렌더링 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--metrics-report", help="구간별 소요 시간 JSON 리포트 저장 경로")
+    return parser.parse_args(argv)
+
+
+def load_params(path=None):
+    """기본 파라미터에 params 파일 내용을 덮어써서 반환
+
+    Args:
+        path (str): 파라미터 JSON 파일 경로 (None이면 기본값 그대로)
+
+    Returns:
+        dict: 시뮬레이션 파라미터
+    """
+    from pricing.simulation import DEFAULT_PARAMS
+
+    params = dict(DEFAULT_PARAMS)
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            user_params = json.load(f)
+        unknown = set(user_params) - set(DEFAULT_PARAMS)
+        if unknown:
+            raise SystemExit(f"알 수 없는 파라미터: {', '.join(sorted(unknown))}")
+        params.update(user_params)
+    return params
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    params = load_params(args.params)
+
+    from util import metrics
+    from pricing.simulation import simulate, summarize
+
+    results = []
+    for n, ticker in enumerate(args.tickers):
+        seed = None if args.seed is None else args.seed + n
+        if args.plot:
+            from pricing.viz import viz_loss
+            viz_loss(ticker, params, seed=seed)
+            continue
+        result = simulate(ticker, params, seed=seed)
+        results.append(summarize(result))
+        if args.report_dir:
+            from pricing.report import render_report
+            render_report(result, args.report_dir, fmt=args.report_format, workers=args.workers)
+
+    if not args.plot:
+        payload = {"params": params, "seed": args.seed, "results": results}
+        if args.output == "-":
+            json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+            sys.stdout.write("\n")
+        else:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+
+    metrics.dump_report(args.metrics_report)
@@ -0,0 +1,324 @@
+import os
+import time
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from util import metrics
+
+QUANTILES = (5, 25, 50, 75, 95)
+TARGET_LOSS_RATIOS = (70, 75, 80)
+FIGURES = ("paths", "last_price", "jump_count", "payments", "premiums", "basis_risk", "loss_ratio")
+
+
+def _box_stats(values, label, max_fliers=1000):
+    """matplotlib bxp용 상자그림 통계 (원본 데이터 없이 그릴 수 있도록 미리 계산)
+
+    이상치는 정렬 후 고르게 max_fliers개만 남긴다 (최솟값/최댓값은 항상 포함).
+    """
+    if len(values) == 0:
+        values = np.zeros(1)
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    is_inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    inside = values[is_inside]
+    fliers = np.sort(values[~is_inside])
+    if len(fliers) > max_fliers:
+        fliers = fliers[np.linspace(0, len(fliers) - 1, max_fliers).astype(np.int64)]
+    return {
+        'label': label, 'med': med, 'q1': q1, 'q3': q3,
+        'whislo': inside.min(), 'whishi': inside.max(),
+        'mean': values.mean(), 'fliers': fliers,
+    }
+
+
+def _quantile_bands(prices, chunk_days=16, max_threads=4):
+    """일자별 분위수 밴드
+
+    경로 수가 많아도 메모리를 덜 쓰도록 며칠씩 나눠서 계산하고,
+    numpy의 partition은 GIL을 풀기 때문에 구간별로 스레드에 나눠 맡긴다.
+    스레드마다 chunk_days x 경로 수 블록을 복사하므로 (100만 경로면 약 128MB)
+    코어 수와 상관없이 max_threads개까지만 동시에 계산한다.
+    """
+    bands = np.empty((len(QUANTILES), prices.shape[0]))
+
+    def fill(start):
+        block = prices[start:start + chunk_days]
+        bands[:, start:start + len(block)] = np.percentile(block, QUANTILES, axis=1)
+
+    with ThreadPoolExecutor(max_workers=min(max_threads, os.cpu_count() or 1)) as pool:
+        list(pool.map(fill, range(0, prices.shape[0], chunk_days)))
+    return bands
+
+
+def _histogram(values, bins):
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    return np.histogram(values, bins=bins)
+
+
+@metrics.timed("goods_report_aggregate")
+def build_aggregates(result, max_paths=200, bins=20, seed=0):
+    """시뮬레이션 결과를 그래프용 집계값으로 축약
+
+    경로 전체(T x N)는 여기서 한 번만 훑고, 이후 그래프는 이 집계값만 사용한다.
+
+    Args:
+        result (tuple): run_loss_simulations 반환값
+        max_paths (int): 그래프에 그릴 점프 경로 최대 개수
+        bins (int): 히스토그램 구간 수
+        seed (int): 경로 표본 추출 시드
+
+    Returns:
+        dict: 히스토그램, 분위수 밴드, 경로 표본, 점프 지점, 상자그림 통계, 손해율 등
+    """
+    ticker, price_df, last_price_list, jump_indices_list, count_jump, insurance_payments, insurance_premiums = result
+    prices = price_df.to_numpy()  # (T+1, N), dtype 그대로 사용 (복사 최소화)
+    last_prices = np.asarray(last_price_list, dtype=float)
+    count_jump = np.asarray(count_jump, dtype=np.int64)
+    payments = np.array([p[0] if isinstance(p, np.ndarray) else p for p in insurance_payments], dtype=float)
+    premiums = np.asarray(insurance_premiums, dtype=float)
+
+    # 점프가 있는 경로 중 최대 max_paths개만 표본으로 사용
+    jump_paths = np.flatnonzero(count_jump > 0)
+    if len(jump_paths) > max_paths:
+        jump_paths = np.sort(np.random.default_rng(seed).choice(jump_paths, max_paths, replace=False))
+    sample = prices[:, jump_paths].T.astype(float)  # (표본 수, T+1)
+
+    # 점프 지점 좌표를 한 번에 계산 (iloc 반복 대신 배열 인덱싱)
+    jumps = [np.asarray(jump_indices_list[p], dtype=np.int64) for p in jump_paths]
+    jump_x = np.concatenate(jumps) if jumps else np.zeros(0, dtype=np.int64)
+    jump_col = np.repeat(jump_paths, [len(j) for j in jumps])
+    jump_y = prices[jump_x, jump_col].astype(float) if len(jump_x) else np.zeros(0)
+
+    nonzero_payments = payments[payments != 0]
+    # 최댓값은 한 번만 계산 (리스트 컴프리헨션 안에서 max를 반복 호출하면 O(N^2))
+    premiums_wo_max = premiums[premiums != premiums.max()] if len(premiums) else premiums
+
+    mean_payment = float(payments.mean()) if len(payments) else 0.0
+    mean_premium = float(premiums.mean()) if len(premiums) else 0.0
+    received = int((payments > 0).sum())
+
+    return {
+        'ticker': ticker,
+        'today': date.today().strftime("%Y/%m/%d"),
+        'num_simulations': int(prices.shape[1]),
+        'num_jump_paths': int((count_jump > 0).sum()),
+        'quantiles': QUANTILES,
+        'quantile_bands': _quantile_bands(prices) if prices.size else np.zeros((len(QUANTILES), 0)),
+        'sample_paths': sample,
+        'jump_x': jump_x,
+        'jump_y': jump_y,
+        'last_price_hist': _histogram(last_prices, bins),
+        'last_price_p10': float(np.percentile(last_prices, 10)) if len(last_prices) else 0.0,
+        'last_price_p90': float(np.percentile(last_prices, 90)) if len(last_prices) else 0.0,
+        'last_price_mean': float(last_prices.mean()) if len(last_prices) else 0.0,
+        'jump_count_dist': np.bincount(count_jump) if len(count_jump) else np.zeros(0, dtype=np.int64),
+        'payment_box': _box_stats(payments, '전체'),
+        'payment_hist': _histogram(nonzero_payments, bins),
+        'payment_nonzero_mean': float(nonzero_payments.mean()) if len(nonzero_payments) else 0.0,
+        'premium_box': _box_stats(premiums, '전체'),
+        'premium_hist': _histogram(premiums_wo_max, bins),
+        'premium_wo_max_mean': float(premiums_wo_max.mean()) if len(premiums_wo_max) else 0.0,
+        'mean_payment': mean_payment,
+        'mean_premium': mean_premium,
+        'loss_ratio': mean_payment / mean_premium * 100 if mean_premium else 0.0,
+        'received': received,
+        'not_received': int(len(payments) - received),
+    }
+
+
+def _bar_hist(ax, counts, edges):
+    if len(counts):
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+
+
+def _draw_paths(fig, agg):
+    from matplotlib.collections import LineCollection
+
+    ax = fig.subplots()
+    bands = agg['quantile_bands']
+    days = np.arange(bands.shape[1])
+    if len(days):
+        ax.fill_between(days, bands[0], bands[-1], color='lightblue', alpha=0.4, label=f"{QUANTILES[0]}-{QUANTILES[-1]}%")
+        ax.fill_between(days, bands[1], bands[-2], color='steelblue', alpha=0.4, label=f"{QUANTILES[1]}-{QUANTILES[-2]}%")
+        ax.plot(days, bands[len(QUANTILES) // 2], color='navy', linewidth=1, label='중앙값')
+    sample = agg['sample_paths']
+    if len(sample):
+        x = np.broadcast_to(np.arange(sample.shape[1]), sample.shape)
+        segments = np.stack([x, sample], axis=-1)
+        ax.add_collection(LineCollection(segments, linewidths=0.6, alpha=0.3, colors='gray'))
+    ax.scatter(agg['jump_x'], agg['jump_y'], color='red', s=10, alpha=0.5, label='Jump')
+    ax.autoscale_view()
+    ax.set_title(f"Paths with Poisson Jumps (shown {len(sample)} / {agg['num_jump_paths']} jump paths)", fontsize=14)
+    ax.set_xlabel(f"Day from {agg['today']}", fontsize=12)
+    ax.set_ylabel('Price (KRW)', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+
+def _draw_last_price(fig, agg):
+    ax = fig.subplots()
+    _bar_hist(ax, *agg['last_price_hist'])
+    ax.axvline(agg['last_price_p10'], color='r', linestyle='dashed', linewidth=1, label='10%')
+    ax.axvline(agg['last_price_p90'], color='r', linestyle='dashed', linewidth=1, label='90%')
+    ax.set_title(f"Histogram mean: {agg['last_price_mean']:,.2f}", fontsize=14)
+    ax.set_xlabel('Price (KRW)', fontsize=12)
+    ax.set_ylabel('빈도 수', fontsize=12)
+    ax.legend()
+
+
+def _draw_jump_count(fig, agg):
+    ax = fig.subplots()
+    dist = agg['jump_count_dist']
+    ax.bar(np.arange(len(dist)), dist, width=0.8)
+    ax.set_title('Distribution of Number of Jumps', fontsize=14)
+    ax.set_xlabel('Number of Jumps', fontsize=12)
+    ax.set_ylabel('빈도 수', fontsize=12)
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_box_and_hist(fig, box, hist, hist_mean, name, hist_title):
+    ax1, ax2 = fig.subplots(1, 2)
+    ax1.bxp([box], widths=0.7)
+    ax1.axhline(box['mean'], color='r', linestyle='dashed', linewidth=1, label=f"평균: {box['mean']:,.0f}원")
+    ax1.set_title(f'전체 {name} 분포', fontsize=14)
+    ax1.set_ylabel(f'Insurance {"Payment" if name == "보험금" else "Premium"} (KRW)', fontsize=12)
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+
+    _bar_hist(ax2, *hist)
+    ax2.axvline(hist_mean, color='r', linestyle='dashed', linewidth=1, label=f'평균: {hist_mean:,.0f}원')
+    ax2.set_title(hist_title, fontsize=14)
+    ax2.set_xlabel(f'Insurance {"Payment" if name == "보험금" else "Premium"} (KRW)', fontsize=12)
+    ax2.set_ylabel('빈도 수', fontsize=12)
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+
+
+def _draw_payments(fig, agg):
+    _draw_box_and_hist(fig, agg['payment_box'], agg['payment_hist'], agg['payment_nonzero_mean'], '보험금', '보험금 분포')
+
+
+def _draw_premiums(fig, agg):
+    _draw_box_and_hist(fig, agg['premium_box'], agg['premium_hist'], agg['premium_wo_max_mean'], '보험료', '보험료 분포 (최댓값 제외)')
+
+
+def _draw_basis_risk(fig, agg):
+    ax = fig.subplots()
+    total = agg['received'] + agg['not_received']
+    if total == 0:
+        # 경로가 하나도 없으면 pie가 ValueError를 내므로 빈 그래프로 표시
+        ax.text(0.5, 0.5, '데이터 없음', ha='center', va='center', fontsize=14)
+        ax.set_title('베이시스 리스크 측정\n(보험금 수령 여부 분포)', fontsize=14)
+        ax.axis('off')
+        return
+    labels = [f"보험금 수령\n({agg['received'] / total * 100:.1f}%)",
+              f"보험금 미수령\n({agg['not_received'] / total * 100:.1f}%)"]
+    ax.pie([agg['received'], agg['not_received']], labels=labels, colors=['lightcoral', 'lightblue'],
+           autopct='%1.1f%%', startangle=90)
+    ax.set_title('베이시스 리스크 측정\n(보험금 수령 여부 분포)', fontsize=14)
+    ax.axis('equal')
+
+
+def _draw_loss_ratio(fig, agg):
+    ax1, ax2 = fig.subplots(1, 2)
+    values = [agg['mean_premium'], agg['mean_payment']]
+    bars = ax1.bar(['평균 보험료', '평균 보험금'], values, color=['lightblue', 'lightcoral'])
+    for bar in bars:
+        ax1.text(bar.get_x() + bar.get_width() / 2., bar.get_height(), f'{bar.get_height():,.0f}원',
+                 ha='center', va='bottom')
+    ax1.set_title(f"평균 보험료와 평균 보험금 비교 (손해율: {agg['loss_ratio']:.1f}%)", fontsize=14)
+    ax1.set_ylabel('금액 (KRW)', fontsize=12)
+    ax1.grid(True, alpha=0.3)
+
+    loss_ratios = [agg['loss_ratio'], *TARGET_LOSS_RATIOS]
+    labels = ['현재 손해율', *[f'목표 손해율 {r}%' for r in TARGET_LOSS_RATIOS]]
+    bars = ax2.bar(labels, loss_ratios, color=['lightcoral'] + ['lightblue'] * len(TARGET_LOSS_RATIOS))
+    for bar in bars:
+        ax2.text(bar.get_x() + bar.get_width() / 2., bar.get_height(), f'{bar.get_height():.1f}%',
+                 ha='center', va='bottom')
+    ax2.set_title('현재 손해율과 목표 손해율 비교', fontsize=14)
+    ax2.set_ylabel('손해율 (%)', fontsize=12)
+    ax2.grid(True, alpha=0.3)
+    ax2.set_ylim(min(loss_ratios) * 0.9, max(loss_ratios) * 1.1)
+
+
+_DRAW = {
+    'paths': (_draw_paths, (12, 6)),
+    'last_price': (_draw_last_price, (12, 6)),
+    'jump_count': (_draw_jump_count, (8, 6)),
+    'payments': (_draw_payments, (12, 6)),
+    'premiums': (_draw_premiums, (12, 6)),
+    'basis_risk': (_draw_basis_risk, (8, 6)),
+    'loss_ratio': (_draw_loss_ratio, (16, 6)),
+}
+
+
+def render_figure(name, agg, path):
+    """집계값으로 그래프 하나를 파일로 저장 (pyplot 없이 Agg 캔버스 사용, 프로세스 풀에서 호출 가능)
+
+    Args:
+        name (str): 그래프 이름 (FIGURES 중 하나)
+        agg (dict): build_aggregates 반환값
+        path (str): 저장 경로 (확장자로 png/svg 결정)
+
+    Returns:
+        tuple: (저장 경로, 렌더링 소요 시간(초))
+            워커 프로세스의 메트릭은 부모로 돌아오지 않으므로 소요 시간은 호출한 쪽에서 기록한다
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from pricing.viz import set_korean_font
+
+    draw, figsize = _DRAW[name]
+    start = time.perf_counter()
+    set_korean_font()
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw(fig, agg)
+    fig.tight_layout()
+    fig.savefig(path)
+    return path, time.perf_counter() - start
+
+
+@metrics.timed("goods_report")
+def render_report(result, out_dir, fmt="png", figures=FIGURES, workers=None, max_paths=200):
+    """시뮬레이션 결과로 리포트 그래프를 만들어 out_dir에 저장
+
+    Args:
+        result (tuple): run_loss_simulations 반환값
+        out_dir (str): 저장 폴더
+        fmt (str): 'png' 또는 'svg'
+        figures (tuple): 그릴 그래프 이름 목록
+        workers (int): 그래프 렌더링 프로세스 수 (1이면 현재 프로세스에서 순서대로)
+        max_paths (int): 경로 그래프에 그릴 점프 경로 최대 개수
+
+    Returns:
+        list: 저장된 파일 경로 목록
+    """
+    if fmt not in ("png", "svg"):
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    unknown = set(figures) - set(_DRAW)
+    if unknown:
+        raise ValueError(f"알 수 없는 그래프: {', '.join(sorted(unknown))}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    agg = build_aggregates(result, max_paths=max_paths)
+    prefix = str(agg['ticker']).replace('/', '_')
+    jobs = [(name, os.path.join(out_dir, f"{prefix}_{name}.{fmt}")) for name in figures]
+
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+    if workers <= 1:
+        rendered = [render_figure(name, agg, path) for name, path in jobs]
+    else:
+        # 집계값은 작아서 워커로 넘기는 비용이 거의 없다
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_figure, name, agg, path) for name, path in jobs]
+            rendered = [f.result() for f in futures]
+
+    for (name, _), (_, elapsed) in zip(jobs, rendered):
+        metrics.record("goods_report_render", elapsed, figure=name)
+    return [path for path, _ in rendered]
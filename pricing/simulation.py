@@ -0,0 +1,197 @@
+from datetime import date
+
+import numpy as np
+
+from util import metrics
+
+# ✅ 시뮬레이션 기본 파라미터
+DEFAULT_PARAMS = {
+    'num_simulations': 10000,  # 시뮬레이션 횟수
+    'T': 252,               # 시뮬레이션 기간(거래일)
+    'lambda_event': 0.13,   # 점프 발생 확률
+    'jump_mu': -0.0125,       # 점프 크기의 평균 : 10일 평균
+    'jump_vol': 0.0909,      # 점프 크기의 표준편차
+    'trigger_rate': 0.10,   # 트리거 수익률
+    'epsilon': 0.002        # 보험요율
+}
+
+KOFR = 0.0258     # KOFR 2.581%
+
+
+# ✅ 주가 데이터 불러오기
+@metrics.timed("goods_load_stock_data")
+def load_stock_data(ticker, months=18):
+    # yfinance, dateutil은 import 비용이 커서 실제로 다운로드할 때만 불러온다
+    import yfinance as yf
+    from dateutil.relativedelta import relativedelta
+
+    today = date.today()
+    startD = today - relativedelta(months=months)
+    endD = today
+    return yf.download(ticker, startD, endD, progress=False)
+
+# ✅ 수익률 평균과 표준편차 계산
+@metrics.timed("goods_calc_return_stats")
+def calc_return_stats(stock_data):
+    returns = stock_data['Close'].pct_change().dropna()
+    mu = returns.mean()
+    sigma = returns.std()
+    return mu, sigma
+
+
+def _scalar(value):
+    # yfinance 신버전은 단일 종목도 (ticker별) Series를 돌려줘서 float으로 정리
+    return float(np.asarray(value).reshape(-1)[0])
+
+
+# ✅ 몬테카를로 시뮬레이션
+@metrics.timed("goods_run_loss_simulations")
+def run_loss_simulations( ticker, num_simulations=100, T=252, lambda_event=0.13, jump_mu=-0.01, jump_vol=0.045, trigger_rate=0.05, epsilon = 0.006,
+                          seed=None, stock_data=None, verbose=True ):
+    """포아송 점프 확산 모형으로 주가 경로와 보험금/보험료를 시뮬레이션
+
+    Args:
+        ticker (str): 종목코드 (예: 005930.KS)
+        seed (int): 난수 시드 (None이면 매번 다른 결과)
+        stock_data (DataFrame): 미리 받아 둔 주가 데이터 (None이면 yfinance에서 다운로드)
+        verbose (bool): 입력값과 보험금 지급 로그 출력 여부
+
+    Returns:
+        tuple: (ticker, 가격 경로 DataFrame, 마지막 가격 리스트, 점프 인덱스 리스트,
+                점프 횟수 리스트, 보험금 리스트, 보험료 리스트)
+    """
+    import pandas as pd
+
+    if verbose:
+        print(f"""
+    시뮬레이션 입력값:
+    - 종목코드: {ticker}
+    - 시뮬레이션 횟수: {num_simulations}회
+    - 시뮬레이션 기간: {T}일
+    - 연간 점프 발생률(λ): {lambda_event*252:.3f}회
+    - 점프 크기 평균(μ): {jump_mu:.3%}
+    - 점프 크기 변동성(σ): {jump_vol:.3%}
+    - 트리거 비율: {trigger_rate:.1%}
+    - 일일 보험료율: {epsilon:.3%}
+    """)
+    rng = np.random.default_rng(seed)
+    paths = []  # 경로별 가격 리스트 (마지막에 한 번에 DataFrame으로 변환)
+    last_price_list = []
+    jump_indices_list = []  # 점프 발생 인덱스 리스트 
+    count_jump = []
+    insurance_payments = []  # 보험금 지급 리스트
+    insurance_premiums = []  # 보험료 납입 리스트
+    lambda_event = lambda_event / 252
+    
+    i = KOFR / 252
+    
+    if stock_data is None:
+        stock_data = load_stock_data(ticker)
+    last_price = int(_scalar(stock_data['Close'].iloc[-1]))
+    mu, daily_vol = calc_return_stats(stock_data)
+    mu, daily_vol = _scalar(mu), _scalar(daily_vol)
+
+    with metrics.timer("goods_simulation_loop"):
+        for _i_ in range(num_simulations):
+            count = 0
+            price_list = []
+            price = last_price * (1 + rng.normal(mu, daily_vol))
+            price_list.append(price)
+            jump_indices = []  # 각 시뮬레이션별 점프 인덱스
+            insurance_payment = 0  # 보험금 지급액
+            insurance_premium = 0  # 보험료 납입액
+            trigger_price = None  # 트리거 가격
+            triggered = False
+
+            for t in range(T):
+                if not triggered:  # 보험금 수령 전까지만 보험료 납입
+                    temp = last_price * epsilon / 252# 일일 보험료 납입
+                    insurance_premium += temp * (1 + i) ** -t
+                
+                if triggered:
+                    price = trigger_price
+                else:
+                    event = rng.poisson(lambda_event)
+                    if event >= 1:
+                        jump_return = rng.normal(jump_mu , jump_vol)
+                        price_before_jump = price_list[count]
+                        trigger_price = price_before_jump * (1 - trigger_rate)
+                        price = price_before_jump * (1 - abs(jump_return))
+                    
+                        # 포아송 하락 점프로 인해 트리거 가격 이하로 떨어진 경우
+                        if jump_return < 0 and price < trigger_price:
+                            insurance_payment = trigger_price - price  # 손실액 보전
+                            if verbose:
+                                print(f'sim{_i_}에서 {t}일차에 보험금 지급발생!: {insurance_payment}')
+                            price = trigger_price  # 보험금 지급 후 가격은 트리거 가격
+                            triggered = True
+                        jump_indices.append(count)
+                    else:
+                        price = price_list[count] * (1 + rng.normal(mu, daily_vol))
+            
+                price_list.append(price)
+                count += 1
+
+            paths.append(price_list)
+            last_price_list.append(price_list[-1])
+            jump_indices_list.append(jump_indices)
+            count_jump.append(len(jump_indices))
+            insurance_payments.append(insurance_payment)
+            insurance_premiums.append(insurance_premium)
+
+    df = pd.DataFrame(np.array(paths, dtype=float).T) if paths else pd.DataFrame()
+
+    metrics.inc("goods_simulation_paths", num_simulations, help="시뮬레이션 경로 수")
+    metrics.inc("goods_simulation_jumps", sum(count_jump), help="발생한 점프 수")
+    metrics.inc("goods_insurance_payouts", sum(1 for p in insurance_payments if p), help="보험금 지급 경로 수")
+
+    return ticker, df, last_price_list, jump_indices_list, count_jump, insurance_payments, insurance_premiums
+
+
+def simulate(ticker, params, seed=None, stock_data=None, verbose=False):
+    """params 딕셔너리로 run_loss_simulations 실행 (viz_loss, CLI 공용)"""
+    return run_loss_simulations(
+        ticker=ticker,
+        num_simulations=params['num_simulations'], 
+        T=params['T'], 
+        lambda_event=params['lambda_event'], 
+        jump_mu=params['jump_mu'], 
+        jump_vol=params['jump_vol'],
+        trigger_rate=params['trigger_rate'], 
+        epsilon=params['epsilon'],
+        seed=seed,
+        stock_data=stock_data,
+        verbose=verbose)
+
+
+def summarize(result):
+    """시뮬레이션 결과를 JSON으로 저장 가능한 요약 통계로 변환
+
+    Args:
+        result (tuple): run_loss_simulations 반환값
+
+    Returns:
+        dict: 종목별 요약 (평균 보험금/보험료, 손해율, 수령 비율, 마지막 가격 분위수)
+    """
+    ticker, _, last_price_list, _, count_jump, insurance_payments, insurance_premiums = result
+    payments = np.asarray(insurance_payments, dtype=float)
+    premiums = np.asarray(insurance_premiums, dtype=float)
+    last_prices = np.asarray(last_price_list, dtype=float)
+
+    # num_simulations=0이면 평균은 0, 가격 분위수는 None (빈 배열에 percentile을 쓰면 IndexError)
+    n = len(payments)
+    mean_payment = float(payments.mean()) if n else 0.0
+    mean_premium = float(premiums.mean()) if len(premiums) else 0.0
+    return {
+        'ticker': ticker,
+        'num_simulations': int(n),
+        'mean_payment': mean_payment,
+        'var_payment': float(payments.var()) if n else 0.0,
+        'mean_premium': mean_premium,
+        'loss_ratio': mean_payment / mean_premium * 100 if mean_premium else None,
+        'payout_rate': float((payments > 0).mean()) if n else 0.0,
+        'mean_jumps': float(np.mean(count_jump)) if len(count_jump) else 0.0,
+        'last_price_mean': float(last_prices.mean()) if len(last_prices) else None,
+        'last_price_p10': float(np.percentile(last_prices, 10)) if len(last_prices) else None,
+        'last_price_p90': float(np.percentile(last_prices, 90)) if len(last_prices) else None,
+    }
@@ -0,0 +1,250 @@
+import os
+import time
+from datetime import date
+
+import numpy as np
+
+from util import metrics
+from pricing.simulation import simulate
+
+# Windows 기본 한글 폰트 (없으면 matplotlib 기본 폰트 사용)
+KOREAN_FONT_PATH = os.environ.get("GOODS_KOREAN_FONT", "c:/Windows/Fonts/malgun.ttf")
+
+
+# ✅ 한글 폰트 설정
+def set_korean_font():
+    # pyplot을 불러오지 않으므로 Agg 리포트 워커에서도 그대로 쓸 수 있다
+    import matplotlib.font_manager as fm
+    from matplotlib import rc
+
+    if os.path.exists(KOREAN_FONT_PATH):
+        font_name = fm.FontProperties(fname=KOREAN_FONT_PATH).get_name()
+        rc('font', family=font_name)
+    # 한글 폰트 적용
+    rc('axes', unicode_minus=False)  # 마이너스 부호 깨짐 방지
+
+# ✅ 그래프 표시 (그래프를 만드는 데 걸린 시간만 기록, 창을 닫을 때까지 기다리는 시간은 제외)
+def _show(plt, figure, mark):
+    metrics.record("goods_viz_plotting", time.perf_counter() - mark, figure=figure)
+    plt.show()
+    return time.perf_counter()
+
+# ✅ 메인 함수 (종목코드 ticker를 인자로 받음)
+@metrics.timed("goods_viz_loss")
+def viz_loss(ticker, params, seed=None):
+    # matplotlib은 그래프를 그릴 때만 불러온다 (headless 실행 시 import 하지 않음)
+    import matplotlib.pyplot as plt
+
+    # 시뮬레이션 실행
+    _, price_df, last_price_list, jump_indices_list, count_jump, insurance_payments, insurance_premiums = simulate(
+        ticker, params, seed=seed, verbose=True)
+
+    today = date.today()
+    stock_ticker = ticker
+    stock_name = f'{ticker}'
+    
+    set_korean_font()
+    mark = time.perf_counter()
+    
+    # plt.figure(figsize=(12, 6))
+    # fig = plt.gca()
+    # # 1) 주가 시뮬레이션 경로 + 점프 표시  
+    # for i in range(min(100, price_df.shape[1])):
+    #     fig.plot(price_df.iloc[:, i], alpha=0.2)
+    #     jumps = jump_indices_list[i]
+    #     if jumps:
+    #         fig.scatter(jumps, [price_df.iloc[j, i] for j in jumps], color='red', s=20, marker='o', label='Jump' if i == 0 else "")
+    # handles, labels = fig.get_legend_handles_labels()
+    # if 'Jump' in labels:
+    #     fig.legend()
+    # fig.set_title(f'Predicted stock price of {stock_name}, Now: {round(last_price, 2)}', fontsize=14)
+    # fig.set_xlabel(f'Day from {today.strftime("%Y/%m/%d")}', fontsize=12)
+    # fig.set_ylabel('Price (KRW)', fontsize=12)
+
+    # plt.tight_layout()
+    # plt.show()
+    
+    # # 2) 마지막 가격 히스토그램
+    # plt.figure(figsize=(12, 6))
+    # tem = [int(price) for price in last_price_list]
+    # plt.hist(tem, bins=20)
+    # plt.axvline(np.percentile(tem, 10), color='r', linestyle='dashed', linewidth=1, label='10%')
+    # plt.axvline(np.percentile(tem, 90), color='r', linestyle='dashed', linewidth=1, label='90%')
+    # str_mean = str(round(np.mean(tem), 2))
+    # plt.title('Histogram mean: ' + str_mean, fontsize=14)
+    # plt.xlabel('Price (KRW)', fontsize=12)
+    # plt.ylabel('빈도 수', fontsize=12)
+    # plt.legend()
+    # plt.tight_layout()
+    # plt.show()
+    
+    # # 점프 횟수 분포 시각화
+    # plt.figure(figsize=(8, 6))
+    # plt.hist(count_jump, bins=range(min(count_jump), max(count_jump) + 2, 1), 
+    #         align='left', rwidth=0.8)
+    # plt.title('Distribution of Number of Jumps', fontsize=14)
+    # plt.xlabel('Number of Jumps', fontsize=12)
+    # plt.ylabel('빈도 수', fontsize=12)
+    # plt.grid(True, alpha=0.3)
+    # plt.show()
+    
+    # 점프가 발생한 경로와 점프 지점 시각화
+    plt.figure(figsize=(12, 6))
+    jump_paths = []
+    jump_points = []
+    
+    # 점프가 있는 경로와 점프 지점 선별
+    for i in range(len(count_jump)):
+        if count_jump[i] > 0:
+            jump_paths.append(price_df.iloc[:, i])
+            jump_points.append((i, jump_indices_list[i]))
+            
+    # 점프 발생 경로와 점프 지점 그리기
+    for idx, (path, (path_idx, jumps)) in enumerate(zip(jump_paths, jump_points)):
+        plt.plot(path, alpha=0.3)
+        plt.scatter(jumps, price_df.values[jumps, path_idx], 
+                   color='red', s=30, alpha=0.5)
+        
+    plt.title(f'Paths with Poisson Jumps and Jump Points (Total {len(jump_paths)} paths)', fontsize=14)
+    plt.xlabel(f'Day from {today.strftime("%Y/%m/%d")}', fontsize=12)
+    plt.ylabel('Price (KRW)', fontsize=12)
+    plt.grid(True, alpha=0.3)
+    mark = _show(plt, 'paths', mark)
+    
+    # 보험금 분포 시각화 및 통계량 계산
+    plt.figure(figsize=(8, 6))
+    # array 형태의 값을 int로 변환
+    payments = [int(p[0]) if isinstance(p, np.ndarray) else p for p in insurance_payments]
+    
+    # 평균과 분산 계산
+    mean_payment = np.mean(payments)
+    var_payment = np.var(payments)
+    
+    # 서브플롯 생성
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
+    
+    # 왼쪽 그래프 - 전체 데이터
+    ax1.boxplot(payments, widths=0.7)
+    ax1.axhline(mean_payment, color='r', linestyle='dashed', linewidth=1, label=f'평균: {mean_payment:,.0f}원')
+    ax1.set_title('전체 보험금 분포', fontsize=14)
+    ax1.set_ylabel('Insurance Payment (KRW)', fontsize=12)
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+    
+    # 오른쪽 그래프 - 최대값 제외
+    filtered_payments = [p for p in payments if p != 0]
+    ax2.hist(filtered_payments, bins=20)
+    filtered_mean = np.mean(filtered_payments)
+    ax2.axvline(filtered_mean, color='r', linestyle='dashed', linewidth=1, label=f'평균: {filtered_mean:,.0f}원')
+    ax2.set_title('보험금 분포', fontsize=14)
+    ax2.set_xlabel('Insurance Payment (KRW)', fontsize=12)
+    ax2.set_ylabel('빈도 수', fontsize=12)
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+    
+    plt.tight_layout()
+    mark = _show(plt, 'payments', mark)
+    
+    # 보험료 시각화
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
+    
+    # 왼쪽 그래프 - 전체 데이터
+    ax1.boxplot(insurance_premiums, widths=0.7)
+    mean_premium = np.mean(insurance_premiums)
+    var_premium = np.var(insurance_premiums)
+    ax1.axhline(mean_premium, color='r', linestyle='dashed', linewidth=1, label=f'평균: {mean_premium:,.0f}원')
+    ax1.set_title('전체 보험료 분포', fontsize=14)
+    ax1.set_ylabel('Insurance Premium (KRW)', fontsize=12)
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+    
+    # 오른쪽 그래프 - 최댓값 제외
+    max_premium = max(insurance_premiums)
+    filtered_premiums = [p for p in insurance_premiums if p != max_premium]
+    filtered_mean = np.mean(filtered_premiums)
+    filtered_var = np.var(filtered_premiums)
+    ax2.hist(filtered_premiums, bins=20)
+    ax2.axvline(filtered_mean, color='r', linestyle='dashed', linewidth=1, label=f'평균: {filtered_mean:,.0f}원')
+    ax2.set_title('보험료 분포 (최댓값 제외)', fontsize=14)
+    ax2.set_xlabel('Insurance Premium (KRW)', fontsize=12)
+    ax2.set_ylabel('빈도 수', fontsize=12)
+    ax2.grid(True, alpha=0.3)
+    ax2.legend()
+    
+    plt.tight_layout()
+    mark = _show(plt, 'premiums', mark)
+    
+    # 베이시스 리스크 측정을 위한 파이 차트
+    plt.figure(figsize=(8, 6))
+    
+    # 보험금 수령자와 미수령자 계산
+    received = sum(1 for p in payments if p > 0)
+    not_received = len(payments) - received
+    
+    # 데이터와 레이블 준비
+    sizes = [received, not_received]
+    labels = [f'보험금 수령\n({received/len(payments)*100:.1f}%)', 
+              f'보험금 미수령\n({not_received/len(payments)*100:.1f}%)']
+    colors = ['lightcoral', 'lightblue']
+    
+    plt.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%',
+            startangle=90)
+    plt.title('베이시스 리스크 측정\n(보험금 수령 여부 분포)', fontsize=14)
+    plt.axis('equal')
+    mark = _show(plt, 'basis_risk', mark)
+    
+    # 평균 보험료와 평균 보험금 비교 시각화
+    plt.figure(figsize=(12, 6))
+
+    # 데이터 준비
+    categories = ['평균 보험료', '평균 보험금']
+    values = [mean_premium, mean_payment]
+
+    # 막대 그래프 생성
+    bars = plt.bar(categories, values, color=['lightblue', 'lightcoral'])
+
+    # 막대 위에 값 표시
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height:,.0f}원',
+                ha='center', va='bottom')
+
+    plt.title('평균 보험료와 평균 보험금 비교', fontsize=14)
+    plt.ylabel('금액 (KRW)', fontsize=12)
+    plt.grid(True, alpha=0.3)
+
+    # 손해율 계산 및 표시
+    loss_ratio = (mean_payment / mean_premium) * 100
+    plt.text(0.5, max(values) * 1.1, 
+            f'손해율: {loss_ratio:.1f}%',
+            ha='center', fontsize=12)
+
+    mark = _show(plt, 'premium_vs_payment', mark)
+    
+    # 현재 손해율과 적정 손해율 비교
+    plt.figure(figsize=(12, 6))
+
+    # 데이터 준비
+    loss_ratios = [loss_ratio, 70, 75, 80]
+    labels = ['현재 손해율', '목표 손해율 70%', '목표 손해율 75%', '목표 손해율 80%']
+    colors = ['lightcoral', 'lightblue', 'lightblue', 'lightblue']
+
+    # 막대 그래프 생성
+    bars = plt.bar(labels, loss_ratios, color=colors)
+
+    # 막대 위에 값 표시
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height:.1f}%',
+                ha='center', va='bottom')
+
+    plt.title('현재 손해율과 목표 손해율 비교', fontsize=14)
+    plt.ylabel('손해율 (%)', fontsize=12)
+    plt.grid(True, alpha=0.3)
+
+    # y축 범위 설정 (최소값의 90%부터 최대값의 110%까지)
+    plt.ylim(min(loss_ratios) * 0.9, max(loss_ratios) * 1.1)
+
+    _show(plt, 'loss_ratio', mark)
@@ -0,0 +1,55 @@
+"""NewsStore 동작 확인 스크립트 (fixtures/news_articles.json 사용, 임시 폴더에 DB를 만들고 지움)
+
+실행: python -m util.check_news_store
+(python -O에서도 확인이 빠지지 않도록 assert 대신 check()로 직접 예외를 올린다)
+"""
+import os
+import json
+import tempfile
+
+from util.news_store import NewsStore, ANY_KEYWORD
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "news_articles.json")
+COMPANY = "삼성전자"
+
+
+def load_fixture():
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        return json.load(f)["items"]
+
+
+def check(what, actual, expected):
+    if actual != expected:
+        raise AssertionError(f"{what}: {actual!r} != {expected!r}")
+
+
+def main():
+    articles = load_fixture()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "news.db")
+
+        with NewsStore(db_path) as store:
+            # ✅ 중복 제거: 같은 URL, 끝에 /만 다른 URL은 한 번만 저장
+            check("첫 적재 건수", store.ingest(articles, company=COMPANY), 6)
+            check("재적재 건수", store.ingest(articles, company=COMPANY), 0)  # 다시 넣어도 그대로
+            check("저장된 기사 수", len(store), 6)
+
+            # ✅ 월별 집계: 날짜 없는 기사, 키워드 없는 기사, "사기업"/"공사기간"은 세지 않음
+            check("월별 * 집계", store.monthly_counts(COMPANY), {"2024-01": 2, "2024-03": 1})
+            check("키워드별 집계", store.keyword_counts(COMPANY), {ANY_KEYWORD: 3, "횡령": 1, "배임": 1, "분식회계": 1})
+
+            # ✅ 연간 이벤트 발생률: 2024년 12개월 동안 3건
+            check("연간 발생률", store.event_rate(COMPANY, "2024-01", "2024-12"), 3.0)
+            check("횡령 발생률", store.event_rate(COMPANY, "2024-01", "2024-06", keyword="횡령"), 2.0)
+
+        # ✅ 키워드 목록을 바꿔서 다시 열면 recount()로 저장된 기사를 다시 집계
+        with NewsStore(db_path, keywords=["횡령", "실적"]) as store:
+            check("재집계 후 기사 수", len(store), 6)
+            check("재집계 월별 * 집계", store.monthly_counts(COMPANY), {"2024-01": 1, "2024-03": 1})
+            check("재집계 키워드별 집계", store.keyword_counts(COMPANY), {ANY_KEYWORD: 2, "횡령": 1, "실적": 1})
+
+    print("NewsStore 확인 완료")
+
+if __name__ == "__main__":
+    main()
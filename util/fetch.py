@@ -1,5 +1,8 @@
 import requests
 
+from util import metrics
+
+@metrics.timed("goods_fetch", source="n8n")
 def fetch_n8n (query: str, n8n_url: str) -> str:
     url = f"{n8n_url}/webhook-node/webhook/1234567890"
     headers = {
@@ -10,9 +13,11 @@ def fetch_n8n (query: str, n8n_url: str) -> str:
         "query": query
     }
     response = requests.post(url, headers=headers, json=data)
+    metrics.inc("goods_fetch_responses", source="n8n", status=response.status_code)
     return response.json()
   
 
+@metrics.timed("goods_fetch", source="n8n_naver")
 def fetch_n8n_naver(query: str, display: int = 100, start: int = 1, sort: str = "date") -> str:
     url = 'https://moluvalu.app.n8n.cloud/webhook/41271191-b817-42a2-b8fd-0a82e083f131'
     params = {
@@ -22,4 +27,5 @@ def fetch_n8n_naver(query: str, display: int = 100, start: int = 1, sort: str =
         'sort': sort
     }
     response = requests.get(url, params=params)
+    metrics.inc("goods_fetch_responses", source="n8n_naver", status=response.status_code)
     return response.json()
\ No newline at end of file
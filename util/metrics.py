@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from functools import wraps
+
+# ✅ 계측 on/off 스위치
+# GOODS_METRICS=0 이면 import 시점에 꺼지고, timed 데코레이터는 원본 함수를 그대로 돌려준다 (호출 오버헤드 0)
+ENABLED = os.environ.get("GOODS_METRICS", "1") != "0"
+
+# 시간 히스토그램 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_counters = {}    # (name, labels) -> float
+_histograms = {}  # (name, labels) -> [bucket_counts, sum, count, buckets]
+_help = {}        # name -> (type, help)
+_run_log = deque(maxlen=10000)  # 실행 단위 JSON 리포트용 타이밍 기록 (API 서버에서 무한히 쌓이지 않도록 상한)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items())) if labels else ()
+
+
+def inc(name: str, value: float = 1, /, help: str = "", **labels) -> None:
+    """카운터 증가
+
+    Args:
+        name (str): 메트릭 이름 (Prometheus 출력 시 _total 접미사가 붙음)
+        value (float): 증가량
+        help (str): HELP 문구
+        **labels: 라벨 (값의 종류가 적은 것만 사용할 것)
+    """
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _help.setdefault(name, ("counter", help))
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, value: float, /, buckets=DEFAULT_BUCKETS, help: str = "", **labels) -> None:
+    """히스토그램에 값 하나 기록
+
+    Args:
+        name (str): 메트릭 이름
+        value (float): 관측값
+        buckets (tuple): 버킷 상한 목록 (처음 기록될 때만 사용)
+        help (str): HELP 문구
+        **labels: 라벨
+    """
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _help.setdefault(name, ("histogram", help))
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * len(buckets), 0.0, 0, tuple(buckets)]
+        for i, bound in enumerate(hist[3]):
+            if value <= bound:
+                hist[0][i] += 1
+        hist[1] += value
+        hist[2] += 1
+
+
+def record(name: str, seconds: float, /, **labels) -> None:
+    """다른 곳(예: 워커 프로세스)에서 잰 소요 시간을 timer와 같은 방식으로 기록
+
+    Args:
+        name (str): 구간 이름 (<name>_seconds 히스토그램과 타이밍 리포트에 기록)
+        seconds (float): 소요 시간 (초)
+        **labels: 라벨
+    """
+    if not ENABLED:
+        return
+    observe(f"{name}_seconds", seconds, **labels)
+    with _lock:
+        # 라벨 이름이 stage/seconds여도 덮어쓰지 않도록 라벨은 따로 담는다
+        _run_log.append({"stage": name, "labels": labels, "seconds": round(seconds, 6)})
+
+
+class _Timer:
+    """구간 소요 시간을 <name>_seconds 히스토그램에 기록하는 컨텍스트 매니저"""
+
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _NullTimer:
+    """계측이 꺼져 있을 때 쓰는 빈 컨텍스트 매니저"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str, /, **labels):
+    """with 블록 소요 시간 측정
+
+    Example:
+        with metrics.timer("goods_simulation_loop"):
+            ...
+    """
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name: str, /, **labels):
+    """함수 전체 소요 시간을 측정하는 데코레이터 (계측이 꺼져 있으면 원본 함수를 그대로 반환)"""
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(name, labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels, extra=None):
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in items)
+    return "{" + body + "}"
+
+
+def render_prometheus() -> str:
+    """현재까지 수집된 메트릭을 Prometheus text format(0.0.4)으로 변환
+
+    Returns:
+        str: /metrics 응답 본문
+    """
+    lines = []
+    with _lock:
+        counters = sorted(_counters.items(), key=lambda kv: (kv[0][0], str(kv[0][1])))
+        histograms = sorted(_histograms.items(), key=lambda kv: (kv[0][0], str(kv[0][1])))
+        helps = dict(_help)
+
+    seen = set()
+    for (name, labels), value in counters:
+        metric = f"{name}_total"
+        if metric not in seen:
+            seen.add(metric)
+            lines.append(f"# HELP {metric} {helps[name][1] or name}")
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}{_fmt_labels(labels)} {value}")
+
+    for (name, labels), (counts, total, count, buckets) in histograms:
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# HELP {name} {helps[name][1] or name}")
+            lines.append(f"# TYPE {name} histogram")
+        for bound, c in zip(buckets, counts):
+            lines.append(f"{name}_bucket{_fmt_labels(labels, ('le', bound))} {c}")
+        lines.append(f"{name}_bucket{_fmt_labels(labels, ('le', '+Inf'))} {count}")
+        lines.append(f"{name}_sum{_fmt_labels(labels)} {total}")
+        lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def timing_report() -> dict:
+    """실행 단위 타이밍 리포트 (구간별 호출 순서 기록 + 구간별 합계)
+
+    Returns:
+        dict: {"stages": [{stage, labels, seconds}, ...], "totals": {'name{label="..."}': seconds}}
+    """
+    with _lock:
+        stages = list(_run_log)
+    totals = {}
+    for rec in stages:
+        key = rec["stage"] + _fmt_labels(sorted(rec["labels"].items()))
+        totals[key] = round(totals.get(key, 0) + rec["seconds"], 6)
+    return {"stages": stages, "totals": totals}
+
+
+def dump_report(path: str) -> None:
+    """타이밍 리포트를 JSON 파일로 저장 (path가 비어 있거나 계측이 꺼져 있으면 아무것도 하지 않음)
+
+    Args:
+        path (str): 저장할 JSON 파일 경로
+    """
+    if not ENABLED or not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(timing_report(), f, ensure_ascii=False, indent=2)
+
+
+def reset() -> None:
+    """수집된 메트릭 전체 초기화"""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _help.clear()
+        _run_log.clear()
@@ -0,0 +1,377 @@
+import re
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+from util import metrics
+
+# ✅ 리스크 키워드 (뉴스 수집/집계 공용)
+RISK_KEYWORDS = [
+    "사기", # 하늘 컴1
+    "횡령", # 정수 컴1
+    "배임", # 하늘 컴2
+    "분식회계", # 하늘 컴3
+    "내부자 거래",
+    "주가조작",
+    "세금 탈루",
+    "금감원 조사",
+    "검찰 수사",
+    "경영권 분쟁",
+    "비리",
+    "경영진 구속",
+    "경영진 도피",
+    "내부고발",
+    "윤리경영 위반",
+    "리더십 리스크",
+    "갑질 논란",
+    "오너 구속",
+    "오너 해외 도피",
+    "오너 일가 재판",
+    "오너 일가 탈세",
+    "오너 일가 횡령",
+    "오너 일가 부당거래"
+]
+
+# 키워드와 상관없이 "리스크 키워드가 하나라도 들어간 기사 수"를 담는 집계 행
+ANY_KEYWORD = "*"
+
+# 키워드 바로 뒤에 와도 같은 단어로 보는 조사/접미 글자 (예: 횡령을, 배임죄, 사기꾼)
+# 그 밖의 한글이 붙으면 다른 단어로 본다 (예: 사기업, 공사기간의 "사기")
+KEYWORD_SUFFIXES = "을를이가은는의에와과도만로으죄꾼극범액혐건설"
+
+# 키워드 매칭 규칙 버전 (바뀌면 저장된 기사로 집계를 다시 계산)
+MATCH_VERSION = "2"
+
+
+def keyword_pattern(keyword: str):
+    """키워드 뒤에 조사/접미 글자 외의 한글이 붙지 않은 경우만 찾는 정규식"""
+    return re.compile(re.escape(keyword) + f"(?=[^가-힣]|[{KEYWORD_SUFFIXES}]|$)")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url_hash TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    company TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL DEFAULT '',
+    published TEXT,
+    month TEXT,
+    news_office TEXT,
+    ingested_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_company_month ON articles (company, month);
+
+CREATE TABLE IF NOT EXISTS keyword_counts (
+    company TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    month TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (company, keyword, month)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def url_hash(url: str) -> str:
+    """중복 판정용 URL 해시 (앞뒤 공백, 끝의 / 차이는 같은 기사로 봄)"""
+    return hashlib.sha256(url.strip().rstrip("/").encode("utf-8")).hexdigest()
+
+
+def parse_date(value):
+    """뉴스 날짜 문자열을 YYYY-MM-DD로 변환 (YYYY.MM.DD, ISO, RFC 822 pubDate 지원)
+
+    Returns:
+        str: YYYY-MM-DD, 알 수 없는 형식이면 None
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+    m = re.match(r"(\d{4})[.\-/]?(\d{1,2})[.\-/]?(\d{1,2})", value)
+    if m:
+        try:
+            return datetime(*map(int, m.groups())).strftime("%Y-%m-%d")
+        except ValueError:
+            return None
+    try:
+        return parsedate_to_datetime(value).strftime("%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_article(article: dict, company: str = None) -> dict:
+    """n8n/네이버 응답 형식의 기사 dict를 저장 형식으로 정리
+
+    Args:
+        article (dict): url/link/originallink, title, body/description, date/pubDate, company, news_office 키 사용
+        company (str): 기사에 company가 없을 때 쓸 기업명 (보통 검색어)
+
+    Returns:
+        dict: 저장 형식 기사, URL이 없으면 None
+    """
+    url = article.get("url") or article.get("originallink") or article.get("link")
+    if not url:
+        return None
+    published = parse_date(article.get("published") or article.get("date") or article.get("pubDate"))
+    return {
+        "url_hash": url_hash(url),
+        "url": url.strip(),
+        "company": article.get("company") or company or "",
+        "title": article.get("title") or "",
+        "body": article.get("body") or article.get("content") or article.get("description") or "",
+        "published": published,
+        "month": published[:7] if published else None,
+        "news_office": article.get("news_office"),
+    }
+
+
+class NewsStore:
+    """크롤링한 기사를 저장하는 로컬 SQLite 저장소
+
+    - URL 해시로 중복 제거
+    - 기사가 들어올 때마다 (기업, 키워드, 월)별 기사 수를 keyword_counts에 누적
+      → 점프 모형용 이벤트 빈도는 재스캔 없이 인덱스 조회로 얻는다
+    - 본문 검색은 FTS5 (trigram 토크나이저라 한글 부분 일치 검색 가능)
+
+    Args:
+        path (str): DB 파일 경로 (":memory:"면 메모리 DB, 테스트용)
+        keywords (list): 집계할 키워드 목록 (바뀌면 저장된 기사로 다시 집계)
+    """
+
+    def __init__(self, path: str = "data/news.db", keywords=None):
+        self.path = path
+        self.keywords = list(keywords if keywords is not None else RISK_KEYWORDS)
+        self._patterns = [(kw, keyword_pattern(kw)) for kw in self.keywords]
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.fts = self._create_fts()
+
+        stored = self._get_meta("keywords")
+        if stored is None:
+            self._set_meta("keywords", json.dumps(self.keywords, ensure_ascii=False))
+            self._set_meta("match_version", MATCH_VERSION)
+            self.conn.commit()
+        elif json.loads(stored) != self.keywords or self._get_meta("match_version") != MATCH_VERSION:
+            self.recount()
+
+    def _create_fts(self):
+        # trigram은 SQLite 3.34 이상에서만 지원, 없으면 기본 토크나이저 사용
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+                    f"title, body, content='articles', content_rowid='id', tokenize='{tokenizer}')")
+                return tokenizer
+            except sqlite3.OperationalError as e:
+                if "fts5" in str(e) and "no such module" in str(e):
+                    return None  # FTS5 없이 빌드된 SQLite: 검색은 LIKE로 대체
+        return None
+
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # ✅ 적재
+    def _matched_keywords(self, text):
+        # "사기업 실적"이 "사기"로 잡히지 않도록 키워드 뒤 글자까지 확인 (keyword_pattern 참고)
+        return [kw for kw, pattern in self._patterns if kw in text and pattern.search(text)]
+
+    @metrics.timed("goods_news_ingest")
+    def ingest(self, articles, company: str = None) -> int:
+        """기사 묶음 저장 + 키워드 집계 갱신 (한 트랜잭션)
+
+        Args:
+            articles (list): 기사 dict 목록 (normalize_article 참고)
+            company (str): 기사에 company가 없을 때 쓸 기업명
+
+        Returns:
+            int: 새로 저장된 기사 수 (중복 제외)
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        counts = {}
+        inserted = 0
+        with self._lock, self.conn:
+            for raw in articles:
+                article = normalize_article(raw, company)
+                if article is None:
+                    continue
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO articles (url_hash, url, company, title, body, published, month, news_office, ingested_at) "
+                    "VALUES (:url_hash, :url, :company, :title, :body, :published, :month, :news_office, :now)",
+                    {**article, "now": now})
+                if cur.rowcount == 0:
+                    continue  # 이미 저장된 URL
+                inserted += 1
+                if self.fts:
+                    self.conn.execute("INSERT INTO articles_fts (rowid, title, body) VALUES (?, ?, ?)",
+                                      (cur.lastrowid, article["title"], article["body"]))
+
+                matched = self._matched_keywords(f"{article['title']}\n{article['body']}")
+                if matched and article["month"]:
+                    for kw in matched + [ANY_KEYWORD]:
+                        key = (article["company"], kw, article["month"])
+                        counts[key] = counts.get(key, 0) + 1
+
+            self.conn.executemany(
+                "INSERT INTO keyword_counts (company, keyword, month, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (company, keyword, month) DO UPDATE SET count = count + excluded.count",
+                [(*key, n) for key, n in counts.items()])
+
+        metrics.inc("goods_news_articles_ingested", inserted, help="새로 저장된 기사 수")
+        return inserted
+
+    def recount(self):
+        """저장된 기사 전체로 keyword_counts 재계산 (키워드 목록이나 매칭 규칙이 바뀌었을 때)"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM keyword_counts")
+            counts = {}
+            for company, month, title, body in self.conn.execute(
+                    "SELECT company, month, title, body FROM articles WHERE month IS NOT NULL"):
+                matched = self._matched_keywords(f"{title}\n{body}")
+                for kw in (matched + [ANY_KEYWORD]) if matched else []:
+                    counts[(company, kw, month)] = counts.get((company, kw, month), 0) + 1
+            self.conn.executemany("INSERT INTO keyword_counts (company, keyword, month, count) VALUES (?, ?, ?, ?)",
+                                  [(*key, n) for key, n in counts.items()])
+            self._set_meta("keywords", json.dumps(self.keywords, ensure_ascii=False))
+            self._set_meta("match_version", MATCH_VERSION)
+
+    # ✅ 조회
+    def monthly_counts(self, company: str, keyword: str = ANY_KEYWORD, start_month: str = None, end_month: str = None) -> dict:
+        """기업/키워드의 월별 기사 수
+
+        Args:
+            company (str): 기업명
+            keyword (str): 키워드 (기본: 리스크 키워드 아무거나)
+            start_month (str): 시작 월 YYYY-MM (포함)
+            end_month (str): 종료 월 YYYY-MM (포함)
+
+        Returns:
+            dict: {YYYY-MM: 기사 수}
+        """
+        rows = self.conn.execute(
+            "SELECT month, count FROM keyword_counts WHERE company = ? AND keyword = ? "
+            "AND month >= ? AND month <= ? ORDER BY month",
+            (company, keyword, start_month or "0000-00", end_month or "9999-99"))
+        return dict(rows.fetchall())
+
+    def keyword_counts(self, company: str, start_month: str = None, end_month: str = None) -> dict:
+        """기간 내 키워드별 기사 수 합계
+
+        Returns:
+            dict: {키워드: 기사 수} (ANY_KEYWORD 포함)
+        """
+        rows = self.conn.execute(
+            "SELECT keyword, SUM(count) FROM keyword_counts WHERE company = ? "
+            "AND month >= ? AND month <= ? GROUP BY keyword",
+            (company, start_month or "0000-00", end_month or "9999-99"))
+        return dict(rows.fetchall())
+
+    def event_rate(self, company: str, start_month: str, end_month: str, keyword: str = ANY_KEYWORD) -> float:
+        """점프 모형용 연간 이벤트 발생률 (기간 내 리스크 기사 수 / 기간 연수)
+
+        Args:
+            start_month (str): 시작 월 YYYY-MM
+            end_month (str): 종료 월 YYYY-MM
+
+        Returns:
+            float: 연간 발생 횟수 (lambda_event로 사용)
+        """
+        y0, m0 = map(int, start_month.split("-"))
+        y1, m1 = map(int, end_month.split("-"))
+        n_months = (y1 - y0) * 12 + (m1 - m0) + 1
+        if n_months <= 0:
+            raise ValueError("end_month가 start_month보다 빠릅니다")
+        total = sum(self.monthly_counts(company, keyword, start_month, end_month).values())
+        return total * 12 / n_months
+
+    def search(self, query: str, company: str = None, limit: int = 20) -> list:
+        """제목/본문 검색 (3글자 이상이면 FTS5, 그보다 짧으면 LIKE)
+
+        Returns:
+            list: [{url, company, title, published}, ...] 최신순
+        """
+        params = []
+        if (self.fts == "trigram" and len(query) >= 3) or self.fts == "unicode61":
+            sql = ("SELECT a.url, a.company, a.title, a.published FROM articles_fts f "
+                   "JOIN articles a ON a.id = f.rowid WHERE articles_fts MATCH ?")
+            params.append('"' + query.replace('"', '""') + '"')
+        else:
+            sql = ("SELECT a.url, a.company, a.title, a.published FROM articles a "
+                   "WHERE (a.title LIKE ? ESCAPE '!' OR a.body LIKE ? ESCAPE '!')")
+            like = "%" + query.replace("!", "!!").replace("%", "!%").replace("_", "!_") + "%"
+            params += [like, like]
+        if company:
+            sql += " AND a.company = ?"
+            params.append(company)
+        sql += " ORDER BY a.published DESC LIMIT ?"
+        params.append(limit)
+        rows = self.conn.execute(sql, params).fetchall()
+        return [dict(zip(("url", "company", "title", "published"), row)) for row in rows]
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m util.news_store", description="로컬 뉴스 저장소 적재/조회")
+    parser.add_argument("--db", default="data/news.db", help="SQLite DB 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_ingest = sub.add_parser("ingest", help="기사 JSON 파일 적재 (기사 목록, 또는 items/articles 키를 가진 객체)")
+    p_ingest.add_argument("files", nargs="+")
+    p_ingest.add_argument("--company", help="기사에 company가 없을 때 쓸 기업명")
+
+    p_count = sub.add_parser("count", help="기업별 키워드 기사 수")
+    p_count.add_argument("company")
+    p_count.add_argument("--start", help="시작 월 YYYY-MM")
+    p_count.add_argument("--end", help="종료 월 YYYY-MM")
+
+    p_search = sub.add_parser("search", help="제목/본문 검색")
+    p_search.add_argument("query")
+    p_search.add_argument("--company")
+    p_search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with NewsStore(args.db) as store:
+        if args.command == "ingest":
+            for path in args.files:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    data = data.get("items") or data.get("articles") or []
+                print(f"{path}: {store.ingest(data, company=args.company)}건 저장")
+        elif args.command == "count":
+            counts = store.keyword_counts(args.company, args.start, args.end)
+            for kw, n in sorted(counts.items(), key=lambda kv: -kv[1]):
+                print(f"{kw}\t{n}")
+        elif args.command == "search":
+            for row in store.search(args.query, company=args.company, limit=args.limit):
+                print(f"{row['published']}\t{row['company']}\t{row['title']}\t{row['url']}")
+
+
+if __name__ == "__main__":
+    main()